@@ -0,0 +1,74 @@
+"""Offline one-shot: compact the gradient boosting model.
+
+Gradient boosting predictions are a running sum over the tree ensemble, so
+the ensemble can be truncated to the shortest prefix of trees whose error
+on insurance.csv stays within TOLERANCE of the full model. Fewer trees
+means less memory traffic per prediction and a smaller artifact.
+
+(The request also asked for float32 thresholds/values, but sklearn's Tree
+struct fixes those arrays to float64, so truncation is the achievable
+part.)
+
+Usage: python compact_model.py
+"""
+import os
+import pickle
+import shutil
+
+import numpy as np
+import pandas as pd
+
+MODEL_PKL = 'gradient_boosting_regressor_model.pkl'
+MODEL_BACKUP = MODEL_PKL + '.bak'
+MODEL_JOBLIB = 'gradient_boosting_regressor_model.joblib'
+DATA_CSV = 'insurance.csv'
+# Keep the smallest prefix of trees whose MAE is within this fraction of
+# the full ensemble's MAE.
+TOLERANCE = 0.01
+
+
+def load_features():
+    # Same encoding the app uses: gender, age, bmi, smoker, three region
+    # dummies (southwest is the dropped baseline), children.
+    df = pd.read_csv(DATA_CSV)
+    X = np.column_stack([
+        (df['sex'] == 'male').astype(np.float32),
+        df['age'],
+        df['bmi'],
+        (df['smoker'] == 'yes').astype(np.float32),
+        (df['region'] == 'northeast').astype(np.float32),
+        (df['region'] == 'northwest').astype(np.float32),
+        (df['region'] == 'southeast').astype(np.float32),
+        df['children'],
+    ]).astype(np.float32)
+    return X, df['expenses'].to_numpy()
+
+
+def main():
+    with open(MODEL_PKL, 'rb') as f:
+        model = pickle.load(f)
+
+    X, y = load_features()
+    maes = [np.abs(pred - y).mean() for pred in model.staged_predict(X)]
+    budget = maes[-1] * (1 + TOLERANCE)
+    n_keep = next(i for i, mae in enumerate(maes, start=1) if mae <= budget)
+
+    print(f"full ensemble: {len(maes)} trees, MAE {maes[-1]:.2f}")
+    print(f"keeping {n_keep} trees, MAE {maes[n_keep - 1]:.2f}")
+
+    model.estimators_ = model.estimators_[:n_keep]
+    model.n_estimators_ = n_keep
+    model.train_score_ = model.train_score_[:n_keep]
+
+    # Keep the full ensemble around before overwriting the only artifact.
+    shutil.copyfile(MODEL_PKL, MODEL_BACKUP)
+    with open(MODEL_PKL, 'wb') as f:
+        pickle.dump(model, f)
+    # Drop the app's joblib cache so load_model regenerates it from the
+    # shrunk pickle instead of serving the stale full ensemble.
+    if os.path.exists(MODEL_JOBLIB):
+        os.remove(MODEL_JOBLIB)
+
+
+if __name__ == '__main__':
+    main()